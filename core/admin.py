@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from .models import Client, Invoice, InvoiceItem
 
 
@@ -7,13 +8,23 @@ class InvoiceItemInline(admin.TabularInline):
     extra = 1
 
 
+class InvoiceChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # Prefetch items for the listed rows only; change and delete views load a single invoice.
+        return super().get_queryset(request, exclude_parameters).prefetch_related('items')
+
+
 @admin.register(Invoice)
 class InvoiceAdmin(admin.ModelAdmin):
     list_display = ('id', 'client', 'invoice_type', 'date', 'vehicle', 'total_display')
     list_filter = ('invoice_type', 'date')
+    list_select_related = ('client',)
     search_fields = ('client__name', 'vehicle', 'lic_no', 'chassis_no', 'engine_no')
     inlines = [InvoiceItemInline]
 
+    def get_changelist(self, request, **kwargs):
+        return InvoiceChangeList
+
     def total_display(self, obj):
         if obj.invoice_type == Invoice.Type.PROFORMA:
             return obj.proforma_total_formatted or "—"
@@ -30,4 +41,6 @@ class ClientAdmin(admin.ModelAdmin):
 @admin.register(InvoiceItem)
 class InvoiceItemAdmin(admin.ModelAdmin):
     list_display = ('id', 'invoice', 'description', 'labour_cost', 'parts_cost')
+    list_select_related = ('invoice', 'invoice__client')
+    raw_id_fields = ('invoice',)
     search_fields = ('description',)
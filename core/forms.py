@@ -51,7 +51,8 @@ class WhatsAppEnrollmentForm(forms.Form):
     def __init__(self, *args, eligible_clients=None, **kwargs):
         super().__init__(*args, **kwargs)
         queryset = eligible_clients if eligible_clients is not None else Client.objects.all()
-        self.fields["client"].queryset = queryset.order_by("name")
+        # The dropdown only renders Client.__str__ (the name), so skip the contact columns.
+        self.fields["client"].queryset = queryset.only("id", "name").order_by("name")
 
 
 class WhatsAppFollowUpForm(forms.ModelForm):
@@ -71,38 +72,31 @@ class WhatsAppFollowUpForm(forms.ModelForm):
         return value
 
 
+_PROFORMA_FIELD_ATTRS = {"class": "form-control", "data-proforma-field": "1"}
+_PROFORMA_REQUIRED_ATTRS = {**_PROFORMA_FIELD_ATTRS, "data-proforma-required": "1"}
+
+
 class InvoiceForm(forms.ModelForm):
     class Meta:
         model = Invoice
         fields = list(INVOICE_SHARED_FIELDS) + list(INVOICE_GENERAL_FIELDS) + list(INVOICE_PROFORMA_FIELDS)
         widgets = {
-            "date": forms.DateInput(attrs={"type": "date"}),
-            "invoice_type": forms.Select(),
-            "client": forms.Select(),
-            "proforma_year": forms.NumberInput(attrs={"min": 0}),
-            "proforma_price": forms.NumberInput(attrs={"step": "0.01", "min": 0}),
+            "client": forms.Select(attrs={"class": "form-select"}),
+            "invoice_type": forms.Select(attrs={"class": "form-select"}),
+            "date": forms.DateInput(attrs={"type": "date", "class": "form-control"}),
+            "chassis_no": forms.TextInput(attrs={"class": "form-control"}),
+            "engine_no": forms.TextInput(attrs={"class": "form-control"}),
+            "vehicle": forms.TextInput(attrs={"class": "form-control"}),
+            "lic_no": forms.TextInput(attrs={"class": "form-control"}),
+            "proforma_make": forms.TextInput(attrs=_PROFORMA_REQUIRED_ATTRS),
+            "proforma_model": forms.TextInput(attrs=_PROFORMA_REQUIRED_ATTRS),
+            "proforma_year": forms.NumberInput(attrs={**_PROFORMA_FIELD_ATTRS, "min": 0}),
+            "proforma_colour": forms.TextInput(attrs=_PROFORMA_FIELD_ATTRS),
+            "proforma_cc_rating": forms.TextInput(attrs=_PROFORMA_FIELD_ATTRS),
+            "proforma_price": forms.NumberInput(attrs={**_PROFORMA_REQUIRED_ATTRS, "step": "0.01", "min": 0}),
+            "proforma_currency": forms.TextInput(attrs=_PROFORMA_FIELD_ATTRS),
         }
 
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-
-        for name, field in self.fields.items():
-            if isinstance(field.widget, forms.widgets.Select):
-                css_class = "form-select"
-            else:
-                css_class = "form-control"
-            existing = field.widget.attrs.get("class", "")
-            if css_class not in existing.split():
-                field.widget.attrs["class"] = (existing + " " + css_class).strip()
-
-        for name in INVOICE_PROFORMA_FIELDS:
-            if name in self.fields:
-                self.fields[name].widget.attrs["data-proforma-field"] = "1"
-
-        for name in ("proforma_make", "proforma_model", "proforma_price"):
-            if name in self.fields:
-                self.fields[name].widget.attrs["data-proforma-required"] = "1"
-
     def clean(self):
         cleaned_data = super().clean()
         invoice_type = cleaned_data.get("invoice_type")
@@ -3,6 +3,10 @@ from __future__ import annotations
 
 import base64
 import io
+import threading
+from collections import OrderedDict
+from email import policy
+from email.generator import BytesGenerator
 from email.message import EmailMessage
 from typing import TYPE_CHECKING, List
 
@@ -12,6 +16,28 @@ from django.urls import reverse
 
 from .models import GoogleAccount, Invoice
 
+try:
+    from google_auth_oauthlib.flow import Flow as _Flow
+except ImportError:  # pragma: no cover - optional dependency
+    _Flow = None
+
+try:
+    from googleapiclient.discovery import build as _build
+    from googleapiclient.http import (
+        MediaInMemoryUpload as _MediaInMemoryUpload,
+        MediaIoBaseDownload as _MediaIoBaseDownload,
+        MediaIoBaseUpload as _MediaIoBaseUpload,
+        build_http as _build_http,
+    )
+except ImportError:  # pragma: no cover - optional dependency
+    _build = _build_http = None
+    _MediaInMemoryUpload = _MediaIoBaseDownload = _MediaIoBaseUpload = None
+
+try:
+    from google_auth_httplib2 import AuthorizedHttp as _AuthorizedHttp
+except ImportError:  # pragma: no cover - optional dependency
+    _AuthorizedHttp = None
+
 if TYPE_CHECKING:  # pragma: no cover - typing helper
     from google_auth_oauthlib.flow import Flow
 
@@ -23,39 +49,56 @@ SCOPES = (
     "openid",
 )
 
+DRIVE_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DRIVE_UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+DRIVE_RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+SERVICE_CACHE_SIZE = 32
+HTTP_TIMEOUT = 30
+
+# httplib2 transports are not thread-safe, so each thread keeps its own transport and service cache.
+_service_local = threading.local()
+
 
 class GoogleConfigurationError(RuntimeError):
     """Raised when Google OAuth configuration is missing."""
 
 
 def _get_flow_class():
-    try:
-        from google_auth_oauthlib.flow import Flow
-    except ImportError as exc:  # pragma: no cover - optional dependency
+    if _Flow is None:
         raise GoogleConfigurationError(
             "Google OAuth libraries are not installed. Add 'google-auth-oauthlib' to your environment."
-        ) from exc
-    return Flow
+        )
+    return _Flow
 
 
 def _get_build_function():
-    try:
-        from googleapiclient.discovery import build
-    except ImportError as exc:  # pragma: no cover - optional dependency
+    if _build is None:
         raise GoogleConfigurationError(
             "Google API client library is missing. Install 'google-api-python-client'."
-        ) from exc
-    return build
+        )
+    return _build
 
 
 def _get_media_classes():
-    try:
-        from googleapiclient.http import MediaInMemoryUpload, MediaIoBaseDownload
-    except ImportError as exc:  # pragma: no cover - optional dependency
+    if _MediaInMemoryUpload is None:
         raise GoogleConfigurationError(
             "Google API client library is missing. Install 'google-api-python-client'."
-        ) from exc
-    return MediaInMemoryUpload, MediaIoBaseDownload
+        )
+    return _MediaInMemoryUpload, _MediaIoBaseDownload, _MediaIoBaseUpload
+
+
+def _get_authorized_http(credentials):
+    if _AuthorizedHttp is None or _build_http is None:
+        raise GoogleConfigurationError(
+            "Google API client library is missing. Install 'google-api-python-client'."
+        )
+    http = getattr(_service_local, "http", None)
+    if http is None:
+        # One transport per thread keeps TLS connections to googleapis.com alive across services.
+        # build_http() stops httplib2 following Drive's "308 Resume Incomplete" as a redirect.
+        http = _service_local.http = _build_http()
+        http.timeout = HTTP_TIMEOUT
+    return _AuthorizedHttp(credentials, http=http)
 
 
 def _client_config() -> dict:
@@ -86,16 +129,43 @@ def ensure_account(user) -> GoogleAccount:
     return account
 
 
-def build_drive_service(account: GoogleAccount):
+def _service_cache() -> OrderedDict:
+    cache = getattr(_service_local, "services", None)
+    if cache is None:
+        cache = _service_local.services = OrderedDict()
+    return cache
+
+
+def _build_service(account: GoogleAccount, api: str, version: str):
     credentials = account.get_credentials()
+    # Keying on the token means a refreshed credential builds a fresh service.
+    key = (api, version, account.pk, hash(credentials.token))
+    cache = _service_cache()
+    service = cache.get(key)
+    if service is not None:
+        cache.move_to_end(key)
+        return service
+
     build = _get_build_function()
-    return build("drive", "v3", credentials=credentials)
+    service = build(
+        api,
+        version,
+        http=_get_authorized_http(credentials),
+        cache_discovery=False,
+        static_discovery=True,
+    )
+    cache[key] = service
+    if len(cache) > SERVICE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return service
+
+
+def build_drive_service(account: GoogleAccount):
+    return _build_service(account, "drive", "v3")
 
 
 def build_gmail_service(account: GoogleAccount):
-    credentials = account.get_credentials()
-    build = _get_build_function()
-    return build("gmail", "v1", credentials=credentials)
+    return _build_service(account, "gmail", "v1")
 
 
 def list_drive_folders(account: GoogleAccount) -> List[dict]:
@@ -112,10 +182,22 @@ def list_drive_folders(account: GoogleAccount) -> List[dict]:
     return sorted(response.get("files", []), key=lambda f: f.get("name", ""))
 
 
+def _pdf_media_body(content: bytes):
+    MediaInMemoryUpload, _, MediaIoBaseUpload = _get_media_classes()
+    if len(content) > DRIVE_RESUMABLE_THRESHOLD:
+        # Large PDFs go up in resumable chunks so a dropped connection does not restart the upload.
+        return MediaIoBaseUpload(
+            io.BytesIO(content),
+            mimetype="application/pdf",
+            chunksize=DRIVE_UPLOAD_CHUNK_SIZE,
+            resumable=True,
+        )
+    return MediaInMemoryUpload(content, mimetype="application/pdf", resumable=False)
+
+
 def upload_invoice_pdf(account: GoogleAccount, invoice: Invoice, filename: str, content: bytes) -> dict:
     service = build_drive_service(account)
-    MediaInMemoryUpload, _ = _get_media_classes()
-    media = MediaInMemoryUpload(content, mimetype="application/pdf", resumable=False)
+    media = _pdf_media_body(content)
     metadata = {
         "name": filename,
     }
@@ -142,8 +224,8 @@ def download_drive_file(account: GoogleAccount, file_id: str) -> bytes:
     service = build_drive_service(account)
     request = service.files().get_media(fileId=file_id)
     buffer = io.BytesIO()
-    _, MediaIoBaseDownload = _get_media_classes()
-    downloader = MediaIoBaseDownload(buffer, request)
+    _, MediaIoBaseDownload, _ = _get_media_classes()
+    downloader = MediaIoBaseDownload(buffer, request, chunksize=DRIVE_DOWNLOAD_CHUNK_SIZE)
     done = False
     while not done:
         _, done = downloader.next_chunk()
@@ -165,22 +247,25 @@ def send_invoice_email(
     email["To"] = to_address
     email["From"] = sender
     email["Subject"] = subject
-    email.set_content(message_body)
+    # Fix the transfer encodings up front so serialisation does not rescan the payloads.
+    email.set_content(message_body, cte="quoted-printable")
     email.add_attachment(
         pdf_content,
         maintype="application",
         subtype="pdf",
         filename=filename,
+        cte="base64",
     )
 
-    raw_message = base64.urlsafe_b64encode(email.as_bytes()).decode()
-    return service.users().messages().send(userId="me", body={"raw": raw_message}).execute()
+    # Serialise once with CRLF line endings and encode straight from the buffer without copying it out.
+    buffer = io.BytesIO()
+    BytesGenerator(buffer, policy=policy.SMTP).flatten(email)
+    raw_message = base64.urlsafe_b64encode(buffer.getbuffer())
+    return service.users().messages().send(userId="me", body={"raw": raw_message.decode("ascii")}).execute()
 
 
 def fetch_account_email(account: GoogleAccount) -> str:
-    credentials = account.get_credentials()
-    build = _get_build_function()
-    service = build("oauth2", "v2", credentials=credentials)
+    service = _build_service(account, "oauth2", "v2")
     profile = service.userinfo().get().execute()
     email = profile.get("email", "")
     if email and email != account.email:
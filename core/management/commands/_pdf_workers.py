@@ -0,0 +1,48 @@
+"""Process-pool entry points for the regenerate_pdfs command.
+
+Workers started with ``spawn`` or ``forkserver`` import this module before
+Django is set up, so models are only imported inside the functions.
+"""
+
+
+def regenerate(invoice):
+    from core.models import Invoice
+
+    # Force regeneration of PDF; the new pdf_file path is persisted in batches by the command.
+    if invoice.invoice_type == Invoice.Type.GENERAL:
+        invoice.generate_general_pdf(overwrite=True, store_local=True, save=False)
+    else:
+        invoice.generate_proforma_pdf(overwrite=True, store_local=True, save=False)
+
+
+def init_worker():
+    import django
+
+    django.setup()
+
+    from django.db import connections
+
+    # Never reuse a database connection inherited from the parent process.
+    connections.close_all()
+
+    try:
+        # Import the renderer once per worker instead of on its first invoice; the parent never loads it.
+        import playwright.sync_api  # noqa: F401
+    except ImportError:
+        # Invoice._render_pdf reports the missing dependency per invoice.
+        pass
+
+
+def regen(pk):
+    from core.models import Invoice
+
+    try:
+        invoice = Invoice.objects.select_related('client').prefetch_related('items').get(pk=pk)
+    except Invoice.DoesNotExist:
+        # Deleted since the ids were read.
+        return None
+    try:
+        regenerate(invoice)
+    except Exception as e:
+        return pk, invoice.invoice_type, str(e), None
+    return pk, invoice.invoice_type, None, invoice.pdf_file.name
@@ -1,6 +1,15 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from django.core.management.base import BaseCommand
+from django.db import connections, transaction
 from core.models import Invoice
 
+from core.management.commands._pdf_workers import init_worker, regen, regenerate
+
+CHUNK_SIZE = 200
+SAVE_BATCH_SIZE = 100
+
 
 class Command(BaseCommand):
     help = 'Regenerate PDF files for all invoices to include signature'
@@ -11,43 +20,110 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be done without actually regenerating PDFs',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of worker processes used to render PDFs (1 renders serially)',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
+        workers = options['workers']
+
+        invoices = Invoice.objects.select_related('client').prefetch_related('items')
+        # One scan for the ids; its length doubles as the total, so no separate COUNT(*).
+        pks = list(Invoice.objects.order_by('pk').values_list('pk', flat=True))
 
-        invoices = Invoice.objects.all()
-        total_count = invoices.count()
+        self.stdout.write(f"Found {len(pks)} invoices to process")
 
-        self.stdout.write(f"Found {total_count} invoices to process")
+        if dry_run or workers <= 1:
+            processed, regenerated = self._run_serial(invoices, pks, dry_run)
+        else:
+            processed, regenerated = self._run_parallel(pks, workers)
 
+        self.stdout.write(f"\nProcessed {processed} invoices, regenerated {regenerated} PDFs")
+        if dry_run:
+            self.stdout.write("This was a dry run - no actual changes made")
+
+    def _run_serial(self, invoices, pks, dry_run):
         processed = 0
         regenerated = 0
+        pending = []
 
-        for invoice in invoices:
-            processed += 1
+        # Load invoices a chunk at a time; prefetch_related issues one items query per chunk.
+        for start in range(0, len(pks), CHUNK_SIZE):
+            chunk_pks = pks[start:start + CHUNK_SIZE]
+            chunk = invoices.in_bulk(chunk_pks)
+            for pk in chunk_pks:
+                invoice = chunk.get(pk)
+                if invoice is None:
+                    # Deleted since the ids were read.
+                    continue
+                processed += 1
 
-            if dry_run:
-                self.stdout.write(f"[DRY RUN] Would regenerate PDF for invoice {invoice.pk} ({invoice.invoice_type})")
-                regenerated += 1
-                continue
+                if dry_run:
+                    self.stdout.write(f"[DRY RUN] Would regenerate PDF for invoice {invoice.pk} ({invoice.invoice_type})")
+                    regenerated += 1
+                    continue
 
-            try:
-                # Force regeneration of PDF
-                if invoice.invoice_type == Invoice.Type.GENERAL:
-                    invoice.generate_general_pdf(overwrite=True, store_local=True)
+                try:
+                    regenerate(invoice)
+                except Exception as e:
+                    self._report_failure(invoice.pk, e)
                 else:
-                    invoice.generate_proforma_pdf(overwrite=True, store_local=True)
+                    regenerated += 1
+                    self._report_success(invoice.pk, invoice.invoice_type)
+                    pending.append(invoice)
+                    if len(pending) >= SAVE_BATCH_SIZE:
+                        self._save_pdf_files(pending)
+                        pending = []
 
-                regenerated += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f"✓ Regenerated PDF for invoice {invoice.pk} ({invoice.invoice_type})")
-                )
+        self._save_pdf_files(pending)
+        return processed, regenerated
 
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f"✗ Failed to regenerate PDF for invoice {invoice.pk}: {e}")
-                )
+    def _run_parallel(self, pks, workers):
+        processed = 0
+        regenerated = 0
+        pending = []
 
-        self.stdout.write(f"\nProcessed {processed} invoices, regenerated {regenerated} PDFs")
-        if dry_run:
-            self.stdout.write("This was a dry run - no actual changes made")
+        # Forked workers must not share the parent's database sockets.
+        connections.close_all()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+            futures = [executor.submit(regen, pk) for pk in pks]
+            for future in as_completed(futures):
+                result = future.result()
+                if result is None:
+                    continue
+                processed += 1
+                pk, invoice_type, error, pdf_name = result
+                if error is not None:
+                    self._report_failure(pk, error)
+                else:
+                    regenerated += 1
+                    self._report_success(pk, invoice_type)
+                    pending.append(Invoice(pk=pk, pdf_file=pdf_name))
+                    # Every future is submitted up front, so no worker starts after the parent reconnects here.
+                    if len(pending) >= SAVE_BATCH_SIZE:
+                        self._save_pdf_files(pending)
+                        pending = []
+
+        self._save_pdf_files(pending)
+        return processed, regenerated
+
+    def _save_pdf_files(self, invoices):
+        if not invoices:
+            return
+        with transaction.atomic():
+            Invoice.objects.bulk_update(invoices, ['pdf_file'], batch_size=SAVE_BATCH_SIZE)
+
+    def _report_success(self, pk, invoice_type):
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ Regenerated PDF for invoice {pk} ({invoice_type})")
+        )
+
+    def _report_failure(self, pk, error):
+        self.stdout.write(
+            self.style.ERROR(f"✗ Failed to regenerate PDF for invoice {pk}: {error}")
+        )
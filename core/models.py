@@ -88,15 +88,21 @@ class Invoice(models.Model):
                 continue
         raise last_error
 
+    def _items_sum(self, field: str) -> Decimal:
+        # Sum prefetched items in Python so list views don't aggregate once per row.
+        if 'items' in getattr(self, '_prefetched_objects_cache', {}):
+            v = sum((getattr(item, field) for item in self.items.all()), Decimal('0'))
+        else:
+            v = self.items.aggregate(total=models.Sum(field))['total'] or Decimal('0')
+        return v.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
     @property
     def parts_subtotal(self) -> Decimal:
-        v = self.items.aggregate(total=models.Sum('parts_cost'))['total'] or Decimal('0')
-        return v.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        return self._items_sum('parts_cost')
 
     @property
     def labour_subtotal(self) -> Decimal:
-        v = self.items.aggregate(total=models.Sum('labour_cost'))['total'] or Decimal('0')
-        return v.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        return self._items_sum('labour_cost')
 
     @property
     def gct(self) -> Decimal:
@@ -234,31 +240,31 @@ class Invoice(models.Model):
 
         return pdf_content
 
-    def _store_pdf(self, filename: str, pdf_content: bytes, overwrite: bool = True) -> None:
+    def _store_pdf(self, filename: str, pdf_content: bytes, overwrite: bool = True, save: bool = True) -> None:
         if overwrite and self.pdf_file:
             self.pdf_file.delete(save=False)
         if not self.pdf_file or overwrite:
-            self.pdf_file.save(filename, ContentFile(pdf_content), save=True)
+            self.pdf_file.save(filename, ContentFile(pdf_content), save=save)
 
-    def generate_general_pdf(self, overwrite: bool = True, store_local: bool = True) -> bytes:
+    def generate_general_pdf(self, overwrite: bool = True, store_local: bool = True, save: bool = True) -> bytes:
         filename = f"invoice-{self.invoice_number}-general.pdf"
         pdf_content = self._render_pdf("invoices/detail_pdf.html")
         if store_local:
-            self._store_pdf(filename, pdf_content, overwrite=overwrite)
+            self._store_pdf(filename, pdf_content, overwrite=overwrite, save=save)
         return pdf_content
 
-    def generate_proforma_pdf(self, overwrite: bool = True, store_local: bool = True) -> bytes:
+    def generate_proforma_pdf(self, overwrite: bool = True, store_local: bool = True, save: bool = True) -> bytes:
         filename = f"invoice-{self.invoice_number}-proforma.pdf"
         pdf_content = self._render_pdf("invoices/detail_pdf_proforma.html")
         if store_local:
-            self._store_pdf(filename, pdf_content, overwrite=overwrite)
+            self._store_pdf(filename, pdf_content, overwrite=overwrite, save=save)
         return pdf_content
 
-    def generate_regular_pdf(self, overwrite: bool = True, store_local: bool = True) -> bytes:
+    def generate_regular_pdf(self, overwrite: bool = True, store_local: bool = True, save: bool = True) -> bytes:
         filename = f"invoice-{self.invoice_number}-regular.pdf"
         pdf_content = self._render_pdf("invoices/detail_pdf_regular.html")
         if store_local:
-            self._store_pdf(filename, pdf_content, overwrite=overwrite)
+            self._store_pdf(filename, pdf_content, overwrite=overwrite, save=save)
         return pdf_content
 
     def pdf_filename(self) -> str:
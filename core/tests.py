@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import base64
 import json
+from email import message_from_bytes, policy
 from email.message import EmailMessage as PyEmailMessage
 from datetime import date, timedelta
 from unittest.mock import MagicMock, patch
@@ -194,6 +196,15 @@ class GoogleEmailTests(TestCase):
         self.assertEqual(kwargs["subtype"], "pdf")
         self.assertEqual(kwargs["filename"], "invoice.pdf")
 
+        raw = messages.send.call_args.kwargs["body"]["raw"]
+        self.assertIsInstance(raw, str)
+        sent = message_from_bytes(base64.urlsafe_b64decode(raw), policy=policy.default)
+        body_part, attachment = list(sent.iter_parts())
+        self.assertEqual(body_part["Content-Transfer-Encoding"], "quoted-printable")
+        self.assertEqual(attachment["Content-Transfer-Encoding"], "base64")
+        self.assertEqual(attachment.get_content(), pdf_bytes)
+        self.assertIn(b"\r\n", base64.urlsafe_b64decode(raw))
+
 
 class InvoiceNumberingTests(TestCase):
     def setUp(self) -> None:
@@ -330,7 +341,7 @@ class InvoicePdfDispatchTests(TestCase):
         self.assertEqual(filename, f"invoice-{inv.invoice_number}-proforma.pdf")
 
 
-from core.forms import InvoiceForm
+from core.forms import INVOICE_PROFORMA_FIELDS, InvoiceForm
 
 
 class InvoiceFormCleanTests(TestCase):
@@ -381,3 +392,349 @@ class InvoiceFormCleanTests(TestCase):
         form = self._form(Invoice.Type.PROFORMA)
         self.assertFalse(form.is_valid())
         self.assertIn("proforma_make", form.errors)
+
+
+from decimal import Decimal
+
+from django.contrib.admin.sites import site as admin_site
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.admin import InvoiceAdmin
+from core.models import InvoiceItem
+
+
+class InvoiceAdminTests(TestCase):
+    def setUp(self) -> None:
+        self.client_obj = Client.objects.create(name="Admin Client")
+        self.admin = InvoiceAdmin(Invoice, admin_site)
+        self.superuser = get_user_model().objects.create_superuser(username="admin", password="pass1234")
+        for _ in range(3):
+            invoice = Invoice.objects.create(client=self.client_obj, date=timezone.localdate())
+            InvoiceItem.objects.create(invoice=invoice, description="Oil", labour_cost=Decimal("10.00"), parts_cost=Decimal("33.33"))
+            InvoiceItem.objects.create(invoice=invoice, description="Filter", labour_cost=Decimal("5.00"), parts_cost=Decimal("12.50"))
+
+    def _changelist(self):
+        request = RequestFactory().get("/admin/core/invoice/")
+        request.user = self.superuser
+        return self.admin.get_changelist_instance(request)
+
+    def test_total_display_matches_model_total(self) -> None:
+        for invoice in self._changelist().result_list:
+            aggregated = Invoice.objects.get(pk=invoice.pk).total
+            self.assertEqual(self.admin.total_display(invoice), f"${aggregated:,.2f}")
+
+    def test_changelist_rows_use_prefetched_items(self) -> None:
+        changelist = self._changelist()
+        with self.assertNumQueries(2):
+            for invoice in changelist.result_list:
+                str(invoice.client)
+                self.admin.total_display(invoice)
+
+    def test_change_view_loads_items_once(self) -> None:
+        invoice = Invoice.objects.first()
+        self.client.force_login(self.superuser)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("admin:core_invoice_change", args=[invoice.pk]))
+        self.assertEqual(response.status_code, 200)
+        item_queries = [q["sql"] for q in queries.captured_queries if 'FROM "core_invoiceitem"' in q["sql"]]
+        self.assertEqual(len(item_queries), 1)
+
+
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import Future
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from core.management.commands.regenerate_pdfs import Command as RegeneratePdfsCommand
+
+
+class RegeneratePdfsCommandTests(TestCase):
+    def setUp(self) -> None:
+        self.client_obj = Client.objects.create(name="Regen Client")
+        self.invoices = [
+            Invoice.objects.create(client=self.client_obj, invoice_type=invoice_type, date=timezone.localdate())
+            for invoice_type in (Invoice.Type.GENERAL, Invoice.Type.PROFORMA)
+        ]
+
+    def test_dry_run_lists_every_invoice(self) -> None:
+        out = StringIO()
+        call_command("regenerate_pdfs", "--dry-run", stdout=out)
+        output = out.getvalue()
+        for invoice in self.invoices:
+            self.assertIn(f"Would regenerate PDF for invoice {invoice.pk}", output)
+        self.assertIn("Processed 2 invoices, regenerated 2 PDFs", output)
+
+    def test_serial_run_regenerates_each_invoice(self) -> None:
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            with patch.object(Invoice, "_render_pdf", return_value=b"%PDF-regen") as mock_render:
+                call_command("regenerate_pdfs", "--workers", "1", stdout=out)
+        self.assertEqual(mock_render.call_count, 2)
+        self.assertIn("Processed 2 invoices, regenerated 2 PDFs", out.getvalue())
+        for invoice in self.invoices:
+            invoice.refresh_from_db()
+            self.assertTrue(invoice.pdf_file.name.startswith(f"invoices/invoice-{invoice.invoice_number}-"))
+
+    def test_serial_run_saves_pdf_paths_in_one_update(self) -> None:
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            with patch.object(Invoice, "_render_pdf", return_value=b"%PDF-regen"):
+                with patch.object(Invoice, "save") as mock_save:
+                    call_command("regenerate_pdfs", "--workers", "1", stdout=StringIO())
+        mock_save.assert_not_called()
+
+    def test_dry_run_reads_invoices_without_count_query(self) -> None:
+        with self.assertNumQueries(3):
+            call_command("regenerate_pdfs", "--dry-run", stdout=StringIO())
+
+
+class InlineExecutor:
+    """Runs pool work in the test process so rendering can be patched and the test database shared."""
+
+    instances: list = []
+
+    def __init__(self, max_workers=None, initializer=None, initargs=()) -> None:
+        self.open = True
+        InlineExecutor.instances.append(self)
+        if initializer is not None:
+            initializer(*initargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.open = False
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+class RegeneratePdfsParallelTests(TransactionTestCase):
+    def setUp(self) -> None:
+        self.client_obj = Client.objects.create(name="Parallel Client")
+        self.invoices = [
+            Invoice.objects.create(client=self.client_obj, invoice_type=invoice_type, date=timezone.localdate())
+            for invoice_type in (Invoice.Type.GENERAL, Invoice.Type.PROFORMA)
+        ]
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_override = override_settings(MEDIA_ROOT=media_root.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        InlineExecutor.instances = []
+        for target, replacement in (
+            ("core.management.commands.regenerate_pdfs.ProcessPoolExecutor", InlineExecutor),
+            ("core.models.Invoice._render_pdf", lambda invoice, template_name: b"%PDF-parallel"),
+        ):
+            patcher = patch(target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _assert_regenerated(self) -> None:
+        for invoice in self.invoices:
+            invoice.refresh_from_db()
+            self.assertTrue(invoice.pdf_file.name.startswith(f"invoices/invoice-{invoice.invoice_number}-"))
+
+    def test_workers_regenerate_every_invoice(self) -> None:
+        out = StringIO()
+        call_command("regenerate_pdfs", "--workers", "2", stdout=out)
+        self.assertIn("Processed 2 invoices, regenerated 2 PDFs", out.getvalue())
+        self._assert_regenerated()
+
+    def test_deleted_invoice_is_skipped(self) -> None:
+        out = StringIO()
+        pks = [invoice.pk for invoice in self.invoices]
+        missing_pk = max(pks) + 1000
+        processed, regenerated = RegeneratePdfsCommand(stdout=out)._run_parallel(pks + [missing_pk], 2)
+        self.assertEqual((processed, regenerated), (2, 2))
+        self.assertNotIn(str(missing_pk), out.getvalue())
+        self._assert_regenerated()
+
+    def test_parallel_run_saves_pdf_paths_while_pool_is_open(self) -> None:
+        command = RegeneratePdfsCommand(stdout=StringIO())
+        pool_open_at_save = []
+        original_save = command._save_pdf_files
+
+        def recording_save(invoices):
+            if invoices:
+                pool_open_at_save.append(InlineExecutor.instances[0].open)
+            original_save(invoices)
+
+        command._save_pdf_files = recording_save
+        with patch("core.management.commands.regenerate_pdfs.SAVE_BATCH_SIZE", 1):
+            command._run_parallel([invoice.pk for invoice in self.invoices], 2)
+
+        self.assertEqual(pool_open_at_save, [True, True])
+        self._assert_regenerated()
+
+    def test_worker_module_imports_before_django_setup(self) -> None:
+        # Spawned and forkserver workers unpickle the entry points before django.setup() runs.
+        result = subprocess.run(
+            [sys.executable, "-c", "import core.management.commands._pdf_workers"],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "invoicegen.settings"},
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+from core.google import DRIVE_RESUMABLE_THRESHOLD, upload_invoice_pdf
+
+
+class GoogleDriveUploadTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="drive", password="pass1234")
+        self.account = GoogleAccount.objects.create(user=self.user, email="drive@example.com")
+        self.invoice = Invoice.objects.create(
+            client=Client.objects.create(name="Drive Client"),
+            date=timezone.localdate(),
+        )
+        self.in_memory = MagicMock(name="MediaInMemoryUpload")
+        self.io_base = MagicMock(name="MediaIoBaseUpload")
+        media_patch = patch(
+            "core.google._get_media_classes",
+            return_value=(self.in_memory, MagicMock(), self.io_base),
+        )
+        service_patch = patch("core.google.build_drive_service")
+        media_patch.start()
+        self.service = service_patch.start().return_value
+        self.addCleanup(media_patch.stop)
+        self.addCleanup(service_patch.stop)
+
+    def test_small_pdf_uses_in_memory_upload(self) -> None:
+        upload_invoice_pdf(self.account, self.invoice, "invoice.pdf", b"%PDF-small")
+        self.in_memory.assert_called_once_with(b"%PDF-small", mimetype="application/pdf", resumable=False)
+        self.io_base.assert_not_called()
+
+    def test_large_pdf_uses_resumable_upload(self) -> None:
+        content = b"0" * (DRIVE_RESUMABLE_THRESHOLD + 1)
+        upload_invoice_pdf(self.account, self.invoice, "invoice.pdf", content)
+        self.in_memory.assert_not_called()
+        self.assertTrue(self.io_base.call_args.kwargs["resumable"])
+        media = self.io_base.return_value
+        self.assertIs(self.service.files.return_value.create.call_args.kwargs["media_body"], media)
+
+
+from core.google import _service_cache, build_drive_service, build_gmail_service
+
+
+class GoogleServiceCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="cache", password="pass1234")
+        self.account = GoogleAccount.objects.create(user=self.user)
+        self.credentials = MagicMock(token="token-1")
+        credentials_patch = patch.object(GoogleAccount, "get_credentials", return_value=self.credentials)
+        build_patch = patch("core.google._get_build_function")
+        http_patch = patch("core.google._get_authorized_http")
+        credentials_patch.start()
+        http_patch.start()
+        self.addCleanup(http_patch.stop)
+        self.build = build_patch.start().return_value
+        self.build.side_effect = lambda *args, **kwargs: MagicMock()
+        self.addCleanup(credentials_patch.stop)
+        self.addCleanup(build_patch.stop)
+        self.addCleanup(_service_cache().clear)
+        _service_cache().clear()
+
+    def test_service_is_reused_for_same_token(self) -> None:
+        first = build_drive_service(self.account)
+        self.assertIs(build_drive_service(self.account), first)
+        self.assertEqual(self.build.call_count, 1)
+
+    def test_services_are_cached_per_api(self) -> None:
+        self.assertIsNot(build_drive_service(self.account), build_gmail_service(self.account))
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_refreshed_token_builds_new_service(self) -> None:
+        first = build_drive_service(self.account)
+        self.credentials.token = "token-2"
+        self.assertIsNot(build_drive_service(self.account), first)
+
+
+class InvoiceFormWidgetTests(TestCase):
+    def test_widgets_carry_css_and_proforma_markers(self) -> None:
+        form = InvoiceForm()
+        self.assertEqual(form.fields["client"].widget.attrs["class"], "form-select")
+        self.assertEqual(form.fields["vehicle"].widget.attrs["class"], "form-control")
+        self.assertNotIn("data-proforma-field", form.fields["vehicle"].widget.attrs)
+        for name in INVOICE_PROFORMA_FIELDS:
+            self.assertEqual(form.fields[name].widget.attrs["data-proforma-field"], "1")
+        required = {name for name, field in form.fields.items() if "data-proforma-required" in field.widget.attrs}
+        self.assertEqual(required, {"proforma_make", "proforma_model", "proforma_price"})
+
+
+from core.forms import WhatsAppEnrollmentForm
+
+
+class WhatsAppEnrollmentFormTests(TestCase):
+    def test_client_choices_load_only_id_and_name(self) -> None:
+        Client.objects.create(name="Zed", email="zed@example.com")
+        Client.objects.create(name="Amy", phone="555-0100")
+        form = WhatsAppEnrollmentForm()
+        with self.assertNumQueries(1):
+            labels = [label for _, label in form.fields["client"].choices][1:]
+        self.assertEqual(labels, ["Amy", "Zed"])
+        self.assertEqual(form.fields["client"].queryset.query.deferred_loading, ({"id", "name"}, False))
+
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import skipIf
+
+from core.google import HTTP_TIMEOUT, _AuthorizedHttp, _build_http, _get_authorized_http, _service_local
+
+
+class _ResumeIncompleteHandler(BaseHTTPRequestHandler):
+    def do_PUT(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        # Drive acknowledges each resumable chunk this way, without a Location header.
+        self.send_response(308, "Resume Incomplete")
+        self.send_header("Range", "bytes=0-3")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class GoogleSharedHttpTests(TestCase):
+    def setUp(self) -> None:
+        _service_local.__dict__.pop("http", None)
+        self.addCleanup(lambda: _service_local.__dict__.pop("http", None))
+
+    @patch("core.google._AuthorizedHttp")
+    @patch("core.google._build_http")
+    def test_transport_is_shared_within_a_thread(self, mock_build_http: MagicMock, mock_authorized: MagicMock) -> None:
+        first, second = MagicMock(), MagicMock()
+        _get_authorized_http(first)
+        _get_authorized_http(second)
+        mock_build_http.assert_called_once()
+        shared = mock_build_http.return_value
+        self.assertEqual(shared.timeout, HTTP_TIMEOUT)
+        self.assertEqual(
+            [c.kwargs["http"] for c in mock_authorized.call_args_list],
+            [shared, shared],
+        )
+
+    @skipIf(_build_http is None or _AuthorizedHttp is None, "google-api-python-client is not installed")
+    def test_resumable_upload_308_is_not_followed_as_redirect(self) -> None:
+        server = HTTPServer(("127.0.0.1", 0), _ResumeIncompleteHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        authorized = _get_authorized_http(MagicMock())
+        url = f"http://127.0.0.1:{server.server_port}/upload"
+        response, _ = authorized.request(url, "PUT", body=b"%PDF")
+        self.assertEqual(response.status, 308)